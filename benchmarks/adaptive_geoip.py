@@ -0,0 +1,110 @@
+"""Проверка адаптивной параллельности геолокации на локальной замене ip-api
+
+Поднимает локальный HTTP-сервер, отвечающий как ip-api, с задаваемой задержкой
+и ограничением частоты, и показывает, как контроллер меняет параллельность:
+на быстром сервере она растет, при ответах 429 и росте задержки - падает.
+
+Запуск: python benchmarks/adaptive_geoip.py [--count 400]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bot  # noqa: E402
+
+
+class FakeGeoIP:
+    """Параметры поведения сервера (меняются между фазами)"""
+    latency = 0.01  # базовая задержка ответа
+    capacity = 1000  # сколько запросов обслуживается без замедления
+    rate_limit = 0  # запросов в секунду до ответов 429 (0 - без лимита)
+    in_flight = 0
+    recent = []
+    lock = threading.Lock()
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        with FakeGeoIP.lock:
+            now = time.monotonic()
+            FakeGeoIP.recent = [t for t in FakeGeoIP.recent if now - t < 1]
+            FakeGeoIP.recent.append(now)
+            throttled = FakeGeoIP.rate_limit and len(FakeGeoIP.recent) > FakeGeoIP.rate_limit
+            FakeGeoIP.in_flight += 1
+            overload = max(0, FakeGeoIP.in_flight - FakeGeoIP.capacity)
+        try:
+            time.sleep(FakeGeoIP.latency * (1 + overload))
+            if throttled:
+                self._reply(429, {'status': 'fail', 'message': 'too many requests'})
+            else:
+                self._reply(200, {'status': 'success', 'country': 'Japan', 'query': self.path.rsplit('/', 1)[-1]})
+        finally:
+            with FakeGeoIP.lock:
+                FakeGeoIP.in_flight -= 1
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('X-Ttl', '1')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def random_ips(count: int, rng: random.Random) -> list:
+    return [f"{rng.randrange(11, 99)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}" for _ in range(count)]
+
+
+def run_phase(name: str, ips: list):
+    controller = bot.geoip_controller
+    start = time.perf_counter()
+    results = list(bot.run_network_stage(controller, bot.geolocate_ip, ips, batched=False))
+    elapsed = time.perf_counter() - start
+    resolved = sum(1 for _, country in results if country)
+    print(f"{name:<32} {len(ips)} IP за {elapsed:5.1f} сек, определено {resolved}, параллельность {controller.concurrency}")
+    return controller.concurrency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=400)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    bot.GEOIP_API = f"http://127.0.0.1:{server.server_port}/json/"
+    bot.geoip_limiter = bot.RateLimiter(0)
+    rng = random.Random(1)
+
+    start_concurrency = bot.geoip_controller.concurrency
+    fast = run_phase("быстрый сервер", random_ips(args.count, rng))
+
+    FakeGeoIP.capacity, FakeGeoIP.latency = 4, 0.2
+    slow = run_phase("перегрузка (рост задержки)", random_ips(args.count // 4, rng))
+
+    FakeGeoIP.capacity, FakeGeoIP.latency, FakeGeoIP.rate_limit = 1000, 0.01, 20
+    throttled = run_phase("лимит частоты (429)", random_ips(args.count // 4, rng))
+
+    print("\nРешения контроллера:")
+    for timestamp, parameter, old, new, reason in bot.geoip_controller.decisions:
+        print(f"  {parameter}: {old} -> {new} ({reason})")
+
+    server.shutdown()
+    ok = fast > start_concurrency and slow < fast and throttled <= fast
+    print("\nРезультат:", "OK" if ok else "ОШИБКА")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
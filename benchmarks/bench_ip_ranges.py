@@ -0,0 +1,60 @@
+"""Бенчмарк фильтрации зарезервированных IP и поиска по диапазонам CDN
+
+Запуск: python benchmarks/bench_ip_ranges.py [--count 100000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bot  # noqa: E402
+
+
+def generate_ips(count: int, seed: int = 42) -> list:
+    """Детерминированный набор IP: обычные, приватные, CDN и IPv6"""
+    rng = random.Random(seed)
+    ips = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.1:
+            ips.append(f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}")
+        elif kind < 0.2:
+            ips.append(f"104.{rng.randrange(16, 24)}.{rng.randrange(256)}.{rng.randrange(256)}")
+        elif kind < 0.25:
+            ips.append(f"2606:4700::{rng.randrange(65536):x}")
+        else:
+            ips.append(".".join(str(rng.randrange(256)) for _ in range(4)))
+    return ips
+
+
+def measure(name: str, func, ips: list) -> list:
+    start = time.perf_counter()
+    result = func(ips)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40} {elapsed * 1000:9.1f} мс  {len(ips) / elapsed:12,.0f} IP/сек")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    ips = generate_ips(args.count)
+    private_re = re.compile(r'(10\.|192\.168\.|172\.(1[6-9]|2[0-9]|3[0-1])\.)')
+
+    measure("регулярное выражение (старая проверка)", lambda items: [bool(private_re.match(ip)) for ip in items], ips)
+    per_ip = measure("bogon_ranges.lookup по одному", lambda items: [bot.bogon_ranges.lookup(ip) for ip in items], ips)
+    batch = measure("bogon_ranges.classify_batch", bot.bogon_ranges.classify_batch, ips)
+    measure("cdn_ranges.classify_batch", bot.cdn_ranges.classify_batch, ips)
+
+    assert per_ip == batch, "результаты пакетной и поштучной проверки различаются"
+    print(f"Отброшено зарезервированных IP: {sum(1 for label in batch if label)} из {len(ips)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Проверка и бенчмарк парсеров протоколов на эталонном наборе конфигов
+
+Запуск: python benchmarks/bench_protocol_parsers.py [--repeat 2000]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bot  # noqa: E402
+
+UUID = "b831381d-6324-4d53-ad4f-8cda48b30811"
+
+
+def b64(text: str, urlsafe: bool = False) -> str:
+    encode = base64.urlsafe_b64encode if urlsafe else base64.b64encode
+    return encode(text.encode()).decode().rstrip('=')
+
+
+def vmess(**fields) -> str:
+    return "vmess://" + b64(json.dumps(fields))
+
+
+# (конфиг, ожидаемый результат parse_config)
+CORPUS = [
+    # vmess
+    (vmess(v="2", add="jp1.example.com", port="443", id=UUID, host="cdn.example.net"), ("jp1.example.com", 443)),
+    (vmess(v="2", add="1.2.3.4", port=8080, id=UUID), ("1.2.3.4", 8080)),
+    (vmess(v="2", add="1.2.3.4", id=UUID), None),
+    (vmess(v="2", add="1.2.3.4", port="99999", id=UUID), None),
+    ("vmess://not-base64!!", None),
+    # vless
+    (f"vless://{UUID}@de.example.org:443?security=tls#DE", ("de.example.org", 443)),
+    (f"vless://{UUID}@[2606:4700::1]:8443?type=ws#v6", ("2606:4700::1", 8443)),
+    ("vless://short-uuid@de.example.org:443", None),
+    (f"vless://{UUID}@de.example.org", None),
+    # trojan
+    ("trojan://secret@tr.example.com:443?sni=tr.example.com#%F0%9F%87%AF%F0%9F%87%B5", ("tr.example.com", 443)),
+    ("trojan://@tr.example.com:443", None),
+    ("trojan://secret@bad_host!:443", None),
+    # shadowsocks SIP002 и устаревший формат
+    (f"ss://{b64('aes-256-gcm:pass', urlsafe=True)}@5.6.7.8:8388#SS", ("5.6.7.8", 8388)),
+    ("ss://chacha20-ietf-poly1305:pass@ss.example.com:443/?plugin=obfs#x", ("ss.example.com", 443)),
+    (f"ss://{b64('aes-128-gcm:pass@9.9.9.9:1234')}#legacy", ("9.9.9.9", 1234)),
+    (f"ss://{b64('aes-128-gcm')}@9.9.9.9:1234", None),
+    # SIP002: стандартный base64 со знаком '/', %-кодировка, '/' и '@' в пароле
+    ("ss://YWVzLTI1Ni1nY206cDA/@1.2.3.4:8388#x", ("1.2.3.4", 8388)),
+    (f"ss://{b64('aes-256-gcm:p0?>')}@ss.example.com:8388/?plugin=obfs#x", ("ss.example.com", 8388)),
+    ("ss://2022-blake3-aes-128-gcm%3Aabc@1.2.3.4:443#x", ("1.2.3.4", 443)),
+    ("ss://aes-256-gcm:pa/ss@word@ss.example.com:443#x", ("ss.example.com", 443)),
+    (f"ss://{b64('aes-128-gcm:pw?@9.9.9.9:1234')}#legacy-slash", ("9.9.9.9", 1234)),
+    (f"trojan://pa%2Fss@tr.example.com:443?sni=x", ("tr.example.com", 443)),
+    ("ss://garbage", None),
+    # shadowsocksr
+    (f"ssr://{b64('ssr.example.com:8989:origin:aes-256-cfb:plain:' + b64('pw', True) + '/?remarks=x', True)}", ("ssr.example.com", 8989)),
+    (f"ssr://{b64('ssr.example.com:8989:origin', True)}", None),
+    # hysteria2
+    ("hysteria2://auth@hy.example.com:443/?sni=hy.example.com#HY", ("hy.example.com", 443)),
+    ("hy2://auth@7.7.7.7:443,20000-30000/?obfs=salamander", ("7.7.7.7", 443)),
+    ("hysteria2://auth@hy.example.com/?sni=x", None),
+    # tuic
+    (f"tuic://{UUID}:pw@tuic.example.com:443?congestion_control=bbr#T", ("tuic.example.com", 443)),
+    ("tuic://not-uuid:pw@tuic.example.com:443", None),
+    (f"tuic://{UUID}@tuic.example.com:443", None),
+    # неизвестные протоколы и мусор
+    ("socks://user:pw@10.0.0.1:1080", ("10.0.0.1", 1080)),
+    ("просто текст без конфига", None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    failures = 0
+    for config, expected in CORPUS:
+        result = bot.parse_config(config)
+        if result != expected:
+            failures += 1
+            print(f"ОШИБКА: {config[:60]}... -> {result}, ожидалось {expected}")
+    print(f"Корректность: {len(CORPUS) - failures}/{len(CORPUS)}")
+
+    configs = [config for config, _ in CORPUS] * args.repeat
+    start = time.perf_counter()
+    for config in configs:
+        bot.parse_config(config)
+    elapsed = time.perf_counter() - start
+    print(f"parse_config: {len(configs)} конфигов за {elapsed:.2f} сек ({len(configs) / elapsed:,.0f} конфигов/сек)")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
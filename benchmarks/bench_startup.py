@@ -0,0 +1,97 @@
+"""Замер времени запуска бота: загрузка модуля и время до ответа на первое обновление
+
+Время импорта - разница между `python -c "import bot"` и пустым запуском
+интерпретатора. Время до первого ответа - от запуска процесса bot.py до
+ответа на /check_configs, который уже ждет в очереди локального Bot API
+(из load_test.py).
+
+Запуск: python benchmarks/bench_startup.py [--repeat 5]
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import load_test
+
+ROOT = load_test.ROOT
+USER_ID = 100000
+
+
+def run_python(code: str, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def first_reply(url: str, env: dict) -> tuple:
+    """(время до начала опроса getUpdates, время до первого ответа) для одного запуска"""
+    load_test.telegram = telegram = load_test.FakeTelegram()
+    command = "/check_configs"
+    telegram.push_update({"message": {
+        "message_id": 1, "date": int(time.time()), "text": command,
+        "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}],
+        "chat": {"id": USER_ID, "type": "private"},
+        "from": {"id": USER_ID, "is_bot": False, "first_name": "user"}
+    }})
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'bot.py')], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        telegram.polling.wait(60)
+        polling_at = time.perf_counter()
+        replied_at, _, _ = telegram.wait_reply(USER_ID, 0, lambda params: True, 60)
+        if replied_at is None:
+            sys.exit("Бот не ответил на первое обновление")
+        return polling_at - start, replied_at - start
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), load_test.Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    env = dict(
+        os.environ,
+        TELEGRAM_BOT_TOKEN=load_test.TOKEN,
+        TELEGRAM_API_URL=url,
+        GEOIP_API=f"{url}/json/",
+        NEURAL_BASE_URL=f"{url}/v1",
+        NEURAL_API_KEY="load-test",
+        METRICS_PORT="0",
+        PERSISTENCE_DIR="",
+    )
+
+    interpreter = [run_python("pass", env) for _ in range(args.repeat)]
+    imports = [run_python("import bot", env) for _ in range(args.repeat)]
+    runs = [first_reply(url, env) for _ in range(args.repeat)]
+    server.shutdown()
+
+    base = statistics.median(interpreter)
+    print(f"Запуск интерпретатора:        {base:.3f} сек")
+    print(f"Импорт bot (без интерпретатора): {statistics.median(imports) - base:.3f} сек "
+          f"(мин {min(imports) - base:.3f})")
+    print(f"До начала опроса getUpdates:  {statistics.median(run[0] for run in runs):.3f} сек")
+    print(f"До ответа на первое обновление: {statistics.median(run[1] for run in runs):.3f} сек "
+          f"(мин {min(run[1] for run in runs):.3f}, макс {max(run[1] for run in runs):.3f})")
+
+
+if __name__ == '__main__':
+    main()
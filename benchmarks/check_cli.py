@@ -0,0 +1,92 @@
+"""Проверка строгого режима cli.py на локальной замене ip-api
+
+Конфиги подходят по ключевым словам сразу к двум странам, часть из них - на
+IP-адресах CDN (проходят только по ключевым словам). После проверки
+геолокации для первой страны они должны остаться в хранилище: в файле
+второй страны не должно быть пустых строк и потерянных конфигов.
+
+Запуск: python benchmarks/check_cli.py [--count 300]
+"""
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+import load_test
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COUNTRIES = ['Germany', 'Japan']
+
+
+def geo_country(ip: str) -> str:
+    """Страна, которую вернет замена ip-api"""
+    return load_test.GEO_COUNTRIES[hashlib.md5(ip.encode()).digest()[0] % len(load_test.GEO_COUNTRIES)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=300)
+    args = parser.parse_args()
+
+    expected = {country: set() for country in COUNTRIES}
+    lines = []
+    for index in range(args.count):
+        if index % 5 == 0:
+            # Cloudflare: геолокация не запрашивается, отбор только по ключевым словам
+            ip, countries = f"104.16.{index // 250}.{index % 250 + 1}", COUNTRIES
+        else:
+            ip = f"5.{index // 250 + 10}.{index % 250 + 1}.7"
+            countries = [country for country in COUNTRIES if geo_country(ip) == country]
+        config = f"trojan://pw{index}@{ip}:443#Germany-Japan-{index}"
+        lines.append(config)
+        for country in countries:
+            expected[country].add(config)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), load_test.Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    load_test.Settings.geo_latency = 0.0
+
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix='check-cli-') as directory:
+        input_file = os.path.join(directory, 'input.txt')
+        with open(input_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines + lines[:10]) + "\n")
+        env = dict(
+            os.environ,
+            GEOIP_API=f"http://127.0.0.1:{server.server_address[1]}/json/",
+            GEOIP_REQUESTS_PER_MINUTE="0",
+            PERSISTENCE_DIR="",
+            METRICS_PORT="0",
+        )
+        command = [sys.executable, os.path.join(ROOT, 'cli.py'), input_file, '--strict', '--workers', '2',
+                   '--output', os.path.join(directory, 'out')]
+        for country in COUNTRIES:
+            command += ['--country', country]
+        process = subprocess.run(command, env=env, capture_output=True, text=True, timeout=300)
+        if process.returncode != 0:
+            print(process.stderr[-2000:])
+            sys.exit("cli.py завершился с ошибкой")
+
+        for country in COUNTRIES:
+            with open(os.path.join(directory, 'out', f"{country.lower()}.txt"), encoding='utf-8') as f:
+                written = f.read().split("\n")[:-1]
+            blank = sum(1 for line in written if not line)
+            missing = len(expected[country] - set(written))
+            extra = len(set(written) - expected[country] - {''})
+            ok = not blank and not missing and not extra
+            failures += not ok
+            print(f"{country:10} ожидалось {len(expected[country]):>4}, записано {len(written):>4}, "
+                  f"пустых {blank}, потеряно {missing}, лишних {extra}  {'OK' if ok else 'ОШИБКА'}")
+    server.shutdown()
+
+    print(f"\nРезультат: {'OK' if not failures else 'ОШИБКА'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Детерминированный генератор синтетических наборов конфигов
+
+Строки vmess/vless/trojan/ss с реалистичным распределением меток
+(флаги, названия стран и городов, рекламные подписи) и хостов
+(домены в национальных зонах, CDN-домены, IP-адреса). Один и тот же
+seed всегда дает один и тот же набор.
+
+Запуск: python benchmarks/corpus.py --size-mb 15 --output corpus.txt
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+import uuid
+from urllib.parse import quote
+
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024  # Ограничение на размер загружаемого файла в боте
+
+# (вес, флаг, название, город, национальная зона)
+LOCATIONS = [
+    (20, '🇺🇸', 'United States', 'New York', 'us'),
+    (15, '🇩🇪', 'Germany', 'Frankfurt', 'de'),
+    (12, '🇳🇱', 'Netherlands', 'Amsterdam', 'nl'),
+    (10, '🇯🇵', 'Japan', 'Tokyo', 'jp'),
+    (8, '🇷🇺', 'Russia', 'Moscow', 'ru'),
+    (8, '🇫🇮', 'Finland', 'Helsinki', 'fi'),
+    (7, '🇬🇧', 'United Kingdom', 'London', 'uk'),
+    (6, '🇸🇬', 'Singapore', 'Singapore', 'sg'),
+    (5, '🇫🇷', 'France', 'Paris', 'fr'),
+    (4, '🇹🇷', 'Turkey', 'Istanbul', 'tr'),
+    (3, '🇰🇷', 'Korea', 'Seoul', 'kr'),
+    (2, '🇨🇦', 'Canada', 'Toronto', 'ca'),
+]
+PROTOCOLS = [(35, 'vless'), (30, 'vmess'), (20, 'ss'), (15, 'trojan')]
+HOST_KINDS = [(45, 'ip'), (35, 'national'), (20, 'generic')]
+GENERIC_ZONES = ['com', 'net', 'org', 'xyz', 'top', 'io']
+TAGS = ['', '', '', ' | @free_vpn', ' [TLS]', ' - reality', ' 🚀 fast', ' | tg:@configs_daily', ' #2']
+SS_METHODS = ['aes-256-gcm', 'aes-128-gcm', 'chacha20-ietf-poly1305']
+
+
+def weighted(rng: random.Random, items: list):
+    weights = [item[0] for item in items]
+    return rng.choices(items, weights=weights)[0]
+
+
+def make_host(rng: random.Random, zone: str, host_kinds: list = HOST_KINDS) -> str:
+    kind = weighted(rng, host_kinds)[1]
+    if kind == 'ip':
+        return f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+    name = ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=rng.randint(4, 12)))
+    if kind == 'national':
+        return f"{name}.{zone}"
+    return f"{rng.choice(['node', 'srv', 'cdn', 'edge', 'v'])}{rng.randint(1, 99)}.{name}.{rng.choice(GENERIC_ZONES)}"
+
+
+def make_remark(rng: random.Random, flag: str, country: str, city: str) -> str:
+    style = rng.random()
+    if style < 0.4:
+        remark = f"{flag} {country}"
+    elif style < 0.7:
+        remark = f"{flag} {city}-{rng.randint(1, 50)}"
+    elif style < 0.85:
+        remark = f"{country.upper()} {city}"
+    else:
+        remark = f"server-{rng.randint(1, 9999)}"  # метка без признаков страны
+    return remark + rng.choice(TAGS)
+
+
+def make_config(rng: random.Random, host_kinds: list = HOST_KINDS) -> str:
+    """Одна строка конфига"""
+    _, flag, country, city, zone = weighted(rng, LOCATIONS)
+    protocol = weighted(rng, PROTOCOLS)[1]
+    host = make_host(rng, zone, host_kinds)
+    port = rng.choice([443, 443, 443, 80, 8443, 2053, rng.randint(10000, 60000)])
+    remark = make_remark(rng, flag, country, city)
+    user_id = str(uuid.UUID(int=rng.getrandbits(128)))
+
+    if protocol == 'vmess':
+        fields = {
+            "v": "2", "ps": remark, "add": host, "port": str(port), "id": user_id,
+            "aid": "0", "net": rng.choice(["ws", "tcp", "grpc"]), "type": "none",
+            "host": rng.choice(["", host]), "path": "/", "tls": rng.choice(["tls", ""])
+        }
+        return "vmess://" + base64.b64encode(json.dumps(fields, ensure_ascii=False).encode()).decode()
+    if protocol == 'vless':
+        query = f"encryption=none&security={rng.choice(['tls', 'reality', 'none'])}&type={rng.choice(['ws', 'tcp', 'grpc'])}&sni={host}"
+        return f"vless://{user_id}@{host}:{port}?{query}#{quote(remark)}"
+    if protocol == 'trojan':
+        return f"trojan://{user_id.replace('-', '')}@{host}:{port}?sni={host}#{quote(remark)}"
+    # SIP002 допускает стандартный base64: в userinfo встречаются '+' и '/'
+    user_info = base64.b64encode(f"{rng.choice(SS_METHODS)}:{user_id[:12]}".encode()).decode().rstrip('=')
+    return f"ss://{user_info}@{host}:{port}#{quote(remark)}"
+
+
+def generate(size_bytes: int, seed: int = 0, duplicate_ratio: float = 0.1, host_kinds: list = HOST_KINDS):
+    """Строки конфигов общим объемом не больше size_bytes (с учетом переводов строк)
+    
+    host_kinds=[(1, 'ip')] дает набор без доменов (проверка геолокации без обращений к DNS).
+    """
+    size_bytes = min(size_bytes, MAX_UPLOAD_BYTES)
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while True:
+        # В реальных подборках часть конфигов повторяется
+        if lines and rng.random() < duplicate_ratio:
+            line = rng.choice(lines)
+        else:
+            line = make_config(rng, host_kinds)
+        line_size = len(line.encode()) + 1
+        if total + line_size > size_bytes:
+            return lines
+        lines.append(line)
+        total += line_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='-')
+    args = parser.parse_args()
+
+    lines = generate(int(args.size_mb * 1024 * 1024), args.seed)
+    text = "\n".join(lines) + "\n"
+    if args.output == '-':
+        sys.stdout.write(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"{len(lines)} конфигов, {len(text.encode()) / 1024 / 1024:.2f} МБ -> {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,420 @@
+"""Нагрузочный тест бота на локальных заменах внешних сервисов
+
+Поднимает один локальный HTTP-сервер, который отвечает как:
+    - Telegram Bot API (getUpdates, sendMessage, editMessageText, getFile, скачивание файлов);
+    - ip-api (/json/<ip>) с задаваемой задержкой и лимитом запросов в минуту;
+    - OpenAI-совместимый API (/v1/chat/completions) с задаваемой задержкой.
+Бот запускается отдельным процессом (bot.py) с адресами этих сервисов, после чего
+N пользователей проходят весь сценарий: /check_configs → файл → страна → режим → число.
+Для каждого шага измеряется время от отправки обновления до ответа бота.
+
+Запуск: python benchmarks/load_test.py --users 50 --mode mixed --size-mb 0.5
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote
+
+import corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN = "123456:LOADTEST"
+BOT_USER = {"id": 123456, "is_bot": True, "first_name": "Load test bot", "username": "load_test_bot"}
+GEO_COUNTRIES = ['Germany', 'Germany', 'United States', 'Netherlands', 'Japan', 'Finland', 'Russia', 'France']
+STEPS = ['start', 'upload', 'set_country', 'country', 'search', 'send']
+
+
+class Settings:
+    """Поведение заменяемых сервисов"""
+    api_latency = 0.0  # задержка ответов Bot API
+    geo_latency = 0.02  # задержка ответов ip-api
+    geo_rate_limit = 0  # запросов в минуту до ответов 429 (0 - без лимита)
+    neural_latency = 0.2  # задержка ответов нейросети
+
+
+class FakeTelegram:
+    """Очередь обновлений для бота и сообщения, отправленные ботом"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.updates = []
+        self.next_update_id = 1
+        self.next_message_id = 1
+        self.outbox = {}  # chat_id -> [(время, метод, параметры)]
+        self.files = {}  # file_id -> содержимое
+        self.api_calls = {}
+        self.polling = threading.Event()
+
+    def push_update(self, update: dict) -> float:
+        with self.condition:
+            update['update_id'] = self.next_update_id
+            self.next_update_id += 1
+            self.updates.append(update)
+            self.condition.notify_all()
+            return time.perf_counter()
+
+    def get_updates(self, offset: int, timeout: float) -> list:
+        self.polling.set()
+        deadline = time.monotonic() + min(timeout, 2)
+        with self.condition:
+            self.updates = [update for update in self.updates if update['update_id'] >= offset]
+            while not self.updates and time.monotonic() < deadline:
+                self.condition.wait(deadline - time.monotonic())
+            return list(self.updates[:100])
+
+    def record(self, method: str, params: dict) -> dict:
+        with self.condition:
+            self.api_calls[method] = self.api_calls.get(method, 0) + 1
+            message_id = params.get('message_id')
+            if message_id is None:
+                message_id = params['message_id'] = self.next_message_id
+                self.next_message_id += 1
+            chat_id = int(params.get('chat_id', 0))
+            self.outbox.setdefault(chat_id, []).append((time.perf_counter(), method, params))
+            self.condition.notify_all()
+        return {
+            "message_id": message_id, "date": int(time.time()), "from": BOT_USER,
+            "chat": {"id": chat_id, "type": "private"}, "text": params.get('text', '')
+        }
+
+    def wait_reply(self, chat_id: int, cursor: int, predicate, timeout: float):
+        """Первое сообщение бота после cursor, подходящее под predicate: (время, параметры, новый cursor)"""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                messages = self.outbox.get(chat_id, [])
+                for index in range(cursor, len(messages)):
+                    sent_at, method, params = messages[index]
+                    if method in ('sendMessage', 'editMessageText') and predicate(params):
+                        return sent_at, params, index + 1
+                cursor = len(messages)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None, None, cursor
+                self.condition.wait(remaining)
+
+
+telegram = FakeTelegram()
+geo_window = {'start': 0.0, 'count': 0}
+geo_lock = threading.Lock()
+geo_requests = [0]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.route()
+
+    def do_POST(self):
+        self.route()
+
+    def route(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b''
+        path = unquote(self.path)
+        if path.startswith(f'/bot{TOKEN}/'):
+            self.bot_api(path.rsplit('/', 1)[-1], body)
+        elif path.startswith(f'/file/bot{TOKEN}/'):
+            file_id = path.rsplit('/', 1)[-1]
+            self.reply(200, telegram.files.get(file_id, b''), 'text/plain')
+        elif path.startswith('/json/'):
+            self.geoip(path.rsplit('/', 1)[-1])
+        elif path.endswith('/chat/completions'):
+            self.neural()
+        else:
+            self.reply_json(404, {'error': 'not found'})
+
+    def bot_api(self, method: str, body: bytes):
+        params = {}
+        for key, value in parse_qsl(body.decode()):
+            try:
+                params[key] = json.loads(value)
+            except ValueError:
+                params[key] = value
+        if Settings.api_latency and method != 'getUpdates':
+            time.sleep(Settings.api_latency)
+
+        if method == 'getUpdates':
+            result = telegram.get_updates(int(params.get('offset', 0)), float(params.get('timeout', 0)))
+        elif method == 'getMe':
+            result = BOT_USER
+        elif method == 'getFile':
+            file_id = params['file_id']
+            result = {
+                "file_id": file_id, "file_unique_id": file_id,
+                "file_size": len(telegram.files.get(file_id, b'')), "file_path": file_id
+            }
+        elif method in ('sendMessage', 'editMessageText'):
+            result = telegram.record(method, params)
+        else:
+            with telegram.condition:
+                telegram.api_calls[method] = telegram.api_calls.get(method, 0) + 1
+            result = True
+        self.reply_json(200, {'ok': True, 'result': result})
+
+    def geoip(self, ip: str):
+        time.sleep(Settings.geo_latency)
+        with geo_lock:
+            geo_requests[0] += 1
+            now = time.monotonic()
+            if now - geo_window['start'] >= 60:
+                geo_window.update(start=now, count=0)
+            geo_window['count'] += 1
+            remaining = Settings.geo_rate_limit - geo_window['count'] if Settings.geo_rate_limit else 45
+            ttl = max(1, int(60 - (now - geo_window['start'])))
+        headers = {'X-Rl': str(max(remaining, 0)), 'X-Ttl': str(ttl)}
+        if remaining < 0:
+            self.reply_json(429, {'status': 'fail', 'message': 'too many requests'}, headers)
+            return
+        # Страна зависит только от IP, чтобы повторные запуски давали одинаковый результат
+        country = GEO_COUNTRIES[hashlib.md5(ip.encode()).digest()[0] % len(GEO_COUNTRIES)]
+        self.reply_json(200, {'status': 'success', 'country': country, 'query': ip}, headers)
+
+    def neural(self):
+        time.sleep(Settings.neural_latency)
+        self.reply_json(200, {
+            "id": "load-test", "object": "chat.completion", "created": int(time.time()), "model": "load-test",
+            "choices": [{
+                "index": 0, "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "Germany"}
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        })
+
+    def reply_json(self, status: int, data, headers: dict = None):
+        self.reply(status, json.dumps(data, ensure_ascii=False).encode(), 'application/json', headers)
+
+    def reply(self, status: int, body: bytes, content_type: str, headers: dict = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # бот остановлен, не дождавшись ответа на getUpdates
+
+    def log_message(self, *args):
+        pass
+
+
+class SimulatedUser(threading.Thread):
+    """Пользователь, проходящий весь сценарий проверки конфигов"""
+
+    def __init__(self, user_id: int, file_id: str, mode: str, country: str, timeout: float):
+        super().__init__(daemon=True)
+        self.user_id = user_id
+        self.file_id = file_id
+        self.mode = mode
+        self.country = country
+        self.timeout = timeout
+        self.cursor = 0
+        self.latencies = {}  # шаг -> секунды
+        self.error = None
+        self.duration = None
+
+    def user(self) -> dict:
+        return {"id": self.user_id, "is_bot": False, "first_name": f"user{self.user_id}"}
+
+    def message(self, **fields) -> dict:
+        message = {
+            "message_id": int(time.time() * 1000) % 2**31, "date": int(time.time()),
+            "chat": {"id": self.user_id, "type": "private"}, "from": self.user()
+        }
+        message.update(fields)
+        return {"message": message}
+
+    def callback(self, data: str, message: dict) -> dict:
+        return {"callback_query": {
+            "id": f"{self.user_id}-{time.monotonic_ns()}", "from": self.user(), "chat_instance": str(self.user_id),
+            "data": data, "message": {
+                "message_id": message['message_id'], "date": int(time.time()), "from": BOT_USER,
+                "chat": {"id": self.user_id, "type": "private"}, "text": message.get('text', '')
+            }
+        }}
+
+    def step(self, name: str, update: dict, predicate):
+        sent_at = telegram.push_update(update)
+        replied_at, params, self.cursor = telegram.wait_reply(self.user_id, self.cursor, predicate, self.timeout)
+        if params is None:
+            raise TimeoutError(f"нет ответа на шаге {name}")
+        self.latencies[name] = replied_at - sent_at
+        return params
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.flow()
+            self.duration = time.perf_counter() - start
+        except Exception as e:
+            self.error = str(e)
+
+    def flow(self):
+        def has_button(data):
+            return lambda params: data in json.dumps(params.get('reply_markup', ''))
+
+        def has_text(*parts):
+            return lambda params: any(part in str(params.get('text', '')) for part in parts)
+
+        command = "/check_configs"
+        self.step('start', self.message(text=command, entities=[{"type": "bot_command", "offset": 0, "length": len(command)}]),
+                  has_text("загрузите"))
+        params = self.step('upload', self.message(document={
+            "file_id": self.file_id, "file_unique_id": self.file_id, "file_name": "configs.txt",
+            "mime_type": "text/plain", "file_size": len(telegram.files[self.file_id])
+        }), has_button('set_country'))
+        params = self.step('set_country', self.callback('set_country', params), has_text("Введите название страны"))
+        params = self.step('country', self.message(text=self.country), has_button('fast_mode'))
+        params = self.step('search', self.callback(f'{self.mode}_mode', params),
+                           has_text("Сколько конфигов прислать", "не найдены"))
+        if "не найдены" in params.get('text', ''):
+            return
+        self.step('send', self.message(text="5"), has_text("Все конфиги отправлены"))
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def peak_rss_mib(pid: int) -> float:
+    """Пиковый объем памяти процесса (VmHWM) в МиБ"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--ramp', type=float, default=2.0, help='Время запуска всех пользователей (сек)')
+    parser.add_argument('--mode', choices=['fast', 'strict', 'mixed'], default='mixed')
+    parser.add_argument('--country', default='Германия')
+    parser.add_argument('--size-mb', type=float, default=0.5, help='Размер файла конфигов одного пользователя')
+    parser.add_argument('--distinct-files', type=int, default=4, help='Сколько разных файлов у пользователей')
+    parser.add_argument('--api-latency', type=float, default=Settings.api_latency)
+    parser.add_argument('--geo-latency', type=float, default=Settings.geo_latency)
+    parser.add_argument('--geo-rate-limit', type=int, default=Settings.geo_rate_limit)
+    parser.add_argument('--neural-latency', type=float, default=Settings.neural_latency)
+    parser.add_argument('--step-timeout', type=float, default=600)
+    parser.add_argument('--bot-log', default=os.devnull, help='Файл для вывода процесса бота')
+    parser.add_argument('--json', dest='json_output', help='Сохранить результаты в JSON')
+    args = parser.parse_args()
+
+    Settings.api_latency = args.api_latency
+    Settings.geo_latency = args.geo_latency
+    Settings.geo_rate_limit = args.geo_rate_limit
+    Settings.neural_latency = args.neural_latency
+
+    # Только IP-адреса: строгий поиск не обращается к настоящему DNS
+    for index in range(args.distinct_files):
+        lines = corpus.generate(int(args.size_mb * 1024 * 1024), seed=index, host_kinds=[(1, 'ip')])
+        telegram.files[f'file-{index}'] = ("\n".join(lines) + "\n").encode()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    state_dir = tempfile.mkdtemp(prefix='load-test-state-')
+    env = dict(
+        os.environ,
+        TELEGRAM_BOT_TOKEN=TOKEN,
+        TELEGRAM_API_URL=url,
+        GEOIP_API=f"{url}/json/",
+        GEOIP_REQUESTS_PER_MINUTE=str(args.geo_rate_limit),
+        NEURAL_BASE_URL=f"{url}/v1",
+        NEURAL_API_KEY="load-test",
+        METRICS_PORT="0",
+        PERSISTENCE_DIR=state_dir,
+    )
+    with open(args.bot_log, 'w') as bot_log:
+        process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'bot.py')], cwd=ROOT, env=env,
+                                   stdout=bot_log, stderr=subprocess.STDOUT)
+    try:
+        if not telegram.polling.wait(60):
+            sys.exit("Бот не начал получать обновления")
+        print(f"Бот запущен (pid {process.pid}), {args.users} пользователей, режим {args.mode}")
+
+        users = []
+        for index in range(args.users):
+            mode = args.mode if args.mode != 'mixed' else ('fast', 'strict')[index % 2]
+            users.append(SimulatedUser(100000 + index, f'file-{index % args.distinct_files}', mode,
+                                       args.country, args.step_timeout))
+        start = time.perf_counter()
+        for user in users:
+            user.start()
+            time.sleep(args.ramp / max(args.users, 1))
+        for user in users:
+            user.join()
+        elapsed = time.perf_counter() - start
+        rss = peak_rss_mib(process.pid)
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        server.shutdown()
+        shutil.rmtree(state_dir, ignore_errors=True)
+    if rss is None:
+        rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+    completed = [user for user in users if user.error is None]
+    failed = [user for user in users if user.error is not None]
+    updates = sum(len(user.latencies) for user in users)
+    report = {
+        'users': args.users, 'mode': args.mode, 'size_mb': args.size_mb,
+        'completed': len(completed), 'failed': len(failed), 'elapsed': round(elapsed, 2),
+        'flows_per_sec': round(len(completed) / elapsed, 3), 'updates_per_sec': round(updates / elapsed, 2),
+        'peak_rss_mib': round(rss, 1), 'geoip_requests': geo_requests[0], 'api_calls': telegram.api_calls,
+        'steps': {}
+    }
+    print(f"\n{'Шаг':<14}{'p50, сек':>10}{'p99, сек':>10}{'макс':>10}{'N':>6}")
+    for step in STEPS + ['flow']:
+        if step == 'flow':
+            values = [user.duration for user in completed]
+        else:
+            values = [user.latencies[step] for user in users if step in user.latencies]
+        if not values:
+            continue
+        stats = {'p50': percentile(values, 0.5), 'p99': percentile(values, 0.99), 'max': max(values), 'count': len(values)}
+        report['steps'][step] = {key: round(value, 4) for key, value in stats.items()}
+        print(f"{step:<14}{stats['p50']:>10.3f}{stats['p99']:>10.3f}{stats['max']:>10.3f}{len(values):>6}")
+
+    print(f"\nЗавершено {len(completed)}/{args.users} сценариев за {elapsed:.1f} сек "
+          f"({report['flows_per_sec']} сценариев/сек, {report['updates_per_sec']} обновлений/сек)")
+    print(f"Пиковая память бота: {report['peak_rss_mib']} МиБ, запросов к ip-api: {geo_requests[0]}")
+    for user in failed[:5]:
+        print(f"Ошибка пользователя {user.user_id}: {user.error}")
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""Пакетная обработка конфигов без Telegram
+
+Читает файлы (или stdin) построчно, убирает дубликаты, отбирает конфиги для
+указанных стран теми же функциями, что и бот (is_config_relevant), и при
+--strict проверяет их геолокацию (validate_configs_by_geolocation).
+Отбор выполняется на всех ядрах, сетевые проверки - с общими кэшами бота.
+Результат: файл <страна>.txt на каждую страну и summary.json.
+
+Запуск:
+    python cli.py dump1.txt dump2.txt --country Germany --country Japan --output out/
+    cat dump.txt | python cli.py - --country Germany --strict
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from array import array
+from collections import deque
+
+import bot
+
+BATCH_LINES = 2000  # Строк в одном задании для процесса отбора
+logger = logging.getLogger('cli')
+
+# Страны для отбора в процессах: [(ключ поиска, коды зон)]
+worker_countries = []
+
+
+def init_worker(countries: list):
+    """Параметры отбора в дочернем процессе"""
+    worker_countries[:] = countries
+
+
+def classify_batch(batch: list, skip_invalid: bool) -> tuple:
+    """Индексы стран для каждого конфига пакета и число отброшенных строк"""
+    results = []
+    invalid = 0
+    for config in batch:
+        if skip_invalid and not bot.validate_config_structure(config):
+            invalid += 1
+            results.append(())
+            continue
+        results.append(tuple(
+            index for index, (target_country, country_codes) in enumerate(worker_countries)
+            if bot.is_config_relevant(config, target_country, country_codes)
+        ))
+    return results, invalid
+
+
+def read_lines(paths: list):
+    """Непустые строки из файлов по порядку ('-' - stdin)"""
+    for path in paths:
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', errors='replace')
+        try:
+            for line in stream:
+                line = line.strip()
+                if line:
+                    yield line
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def resolve_countries(names: list) -> list:
+    """(название, ключ поиска, коды зон) для каждой страны, как при вводе страны в боте"""
+    countries = []
+    for name in names:
+        try:
+            found = bot.find_countries(bot.normalize_text(name))
+        except LookupError:
+            sys.exit(f"Страна не распознана: {name}")
+        countries.append((found[0].name, found[0].name.lower(), bot.get_country_codes(found)))
+    return countries
+
+
+def unique_batches(lines, stats: dict):
+    """Пакеты новых конфигов и их id (дубликаты отбрасываются по хранилищу бота)
+
+    На каждый конфиг берется ссылка до конца работы: иначе хранилище удалит
+    его, когда проверка геолокации отпустит свою ссылку.
+    """
+    seen = set()
+    batch = []
+    batch_ids = []
+    for line in lines:
+        stats['lines'] += 1
+        config_id, = bot.config_store.acquire([line])
+        if config_id in seen:
+            bot.config_store.release([config_id])
+            stats['duplicates'] += 1
+            continue
+        seen.add(config_id)
+        batch.append(line)
+        batch_ids.append(config_id)
+        if len(batch) >= BATCH_LINES:
+            yield batch, batch_ids
+            batch = []
+            batch_ids = []
+    if batch:
+        yield batch, batch_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help="Файлы с конфигами ('-' - stdin)")
+    parser.add_argument('--country', action='append', required=True, help='Страна (можно указать несколько раз)')
+    parser.add_argument('--output', default='output', help='Каталог для результатов')
+    parser.add_argument('--strict', action='store_true', help='Проверять геолокацию отобранных конфигов')
+    parser.add_argument('--skip-invalid', action='store_true', help='Отбрасывать строки, не разбираемые как конфиг')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Процессов для отбора')
+    args = parser.parse_args()
+
+    countries = resolve_countries(args.country)
+    os.makedirs(args.output, exist_ok=True)
+    stats = {'lines': 0, 'duplicates': 0, 'invalid': 0}
+    matched = [array('I') for _ in countries]  # id конфигов, отобранных для каждой страны
+    start_time = time.time()
+
+    # Отбор в процессах; заданий в работе не больше двух на процесс, чтобы не читать весь ввод в память
+    search_params = [(target_country, country_codes) for _, target_country, country_codes in countries]
+    with multiprocessing.Pool(args.workers, initializer=init_worker, initargs=(search_params,)) as pool:
+        pending = deque()
+
+        def collect():
+            batch_ids, result = pending.popleft()
+            batch_matches, invalid = result.get()
+            stats['invalid'] += invalid
+            for config_id, country_indexes in zip(batch_ids, batch_matches):
+                for index in country_indexes:
+                    matched[index].append(config_id)
+
+        for batch, batch_ids in unique_batches(read_lines(args.inputs), stats):
+            pending.append((batch_ids, pool.apply_async(classify_batch, (batch, args.skip_invalid))))
+            if len(pending) >= args.workers * 2:
+                collect()
+        while pending:
+            collect()
+    classification_time = time.time() - start_time
+    logger.info(f"Отбор завершен за {classification_time:.1f} сек: {stats['lines']} строк, {stats['duplicates']} дубликатов")
+
+    summary = {
+        'inputs': args.inputs,
+        'lines': stats['lines'],
+        'unique': stats['lines'] - stats['duplicates'],
+        'duplicates': stats['duplicates'],
+        'invalid': stats['invalid'],
+        'strict': args.strict,
+        'classification_seconds': round(classification_time, 2),
+        'countries': {}
+    }
+    for (name, target_country, _), config_ids in zip(countries, matched):
+        configs = [bot.config_store.get(config_id) for config_id in config_ids]
+        country_summary = {'matched': len(configs)}
+        if args.strict:
+            # Проверка пакетами по размеру, выбранному контроллером геолокации
+            check_start = time.time()
+            valid_configs = []
+            position = 0
+            while position < len(configs):
+                chunk = configs[position:position + bot.geoip_controller.batch_size]
+                position += len(chunk)
+                valid_configs.extend(bot.validate_configs_by_geolocation(chunk, target_country))
+            configs = valid_configs
+            country_summary['validated'] = len(configs)
+            country_summary['validation_seconds'] = round(time.time() - check_start, 2)
+
+        file_name = os.path.join(args.output, f"{name.lower().replace(' ', '_')}.txt")
+        with open(file_name, 'w', encoding='utf-8') as f:
+            for config in configs:
+                f.write(config + "\n")
+        country_summary['file'] = file_name
+        summary['countries'][name] = country_summary
+        logger.info(f"{name}: {len(configs)} конфигов -> {file_name}")
+
+    summary['elapsed_seconds'] = round(time.time() - start_time, 2)
+    with open(os.path.join(args.output, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    bot.network_executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == '__main__':
+    main()